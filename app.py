@@ -3,15 +3,31 @@
 # ======================================================
 
 import os
-import json
-from io import BytesIO
+import csv
+import re
+import gzip
+import zlib
+import mmap
+import hashlib
+import secrets
+import threading
+import orjson
+import msgspec
+from io import BytesIO, StringIO
 from datetime import datetime
+from functools import lru_cache, wraps
 from flask import (
-    Flask, render_template, jsonify, request,
-    send_file
+    Flask, Response, render_template, jsonify, request, session
+)
+from flask.json.provider import DefaultJSONProvider
+from cachetools import TTLCache
+from flask_compress import Compress
+import xlsxwriter
+
+from workbook import (
+    WORKBOOK_PATH, SNAPSHOT_PATH, PROFILE_SHEET_MAP, BLOOM_SHEETS,
+    read_workbook_rows, workbook_digest
 )
-import pandas as pd
-from openpyxl import Workbook, load_workbook
 
 # ------------------------------------------------------
 # App setup
@@ -23,23 +39,105 @@ app = Flask(
     static_folder=os.path.join(BASE_DIR, "static"),
     template_folder=os.path.join(BASE_DIR, "templates")
 )
+def load_secret_key():
+    # SECRET_KEY wins; otherwise one key per checkout in .secret_key, created by
+    # whichever worker boots first, so every gunicorn worker on this host signs
+    # and reads the same session cookies
+    key = os.environ.get("SECRET_KEY")
+    if key:
+        return key
+    path = os.path.join(BASE_DIR, ".secret_key")
+    try:
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}"
+            with open(tmp, "w") as f:
+                f.write(secrets.token_hex(32))
+            try:
+                # atomic: a worker that loses the race just reads the winner's key
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp)
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        # read-only checkout: per-process key, fine for a single worker only
+        return secrets.token_hex(32)
+
+app.secret_key = load_secret_key()
+
+# compress JSON/text responses for clients that accept it (xlsx is already zipped)
+app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/plain", "text/html"]
+app.config["COMPRESS_LEVEL"] = 6
+# Flask-Compress's default, spelled out: /api/mapping negotiates against the same order
+app.config["COMPRESS_ALGORITHM"] = ["zstd", "br", "gzip", "deflate"]
+Compress(app)
 
-WORKBOOK_PATH = os.path.join(BASE_DIR, "SCLOG.xlsx")
 FRONT_JSON = os.path.join(app.static_folder, "data", "SCLOG_front.json")
 
 
 # ------------------------------------------------------
-# Safe JSON loader
+# JSON helpers (orjson)
 # ------------------------------------------------------
 def safe_load_json(path):
     if not os.path.exists(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # orjson parses the mapped file in place: no text decode, no bytes copy
+        with open(path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            return orjson.loads(view)
     except:
         return {}
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    # jsonify() and friends encode through orjson instead of stdlib json
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = OrjsonProvider(app)
+# no pretty-printing, even under debug=True
+app.json.compact = True
+
+
+def json_response(body):
+    # wraps pre-encoded JSON bytes (see the memoised *_json builders)
+    return app.response_class(body, mimetype="application/json")
+
+
+def etag_of(body):
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def static_json(body, etag, cache_control="public, max-age=86400"):
+    # reference data: browsers reuse it, and a matching If-None-Match gets a 304
+    response = json_response(body)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response.make_conditional(request)
+
+
+def workbook_json(body):
+    # SCLOG.xlsx can be replaced while running, so clients revalidate every
+    # time; the tag hashes the body itself, so it also changes when a deploy
+    # changes how the body is built from an unchanged workbook
+    return static_json(body, etag_of(body), "no-cache")
+
+
+# shared by every plain-text (body, status, headers) return
+_TEXT_HDR = {"Content-Type": "text/plain; charset=utf-8"}
+
 MAP = safe_load_json(FRONT_JSON)
 
 DEFAULT_KEYS = {
@@ -52,94 +150,285 @@ DEFAULT_KEYS = {
 for k, v in DEFAULT_KEYS.items():
     MAP.setdefault(k, v)
 
+# MAP never changes after boot: serialise it once and let clients revalidate
+_MAP_BYTES = orjson.dumps(MAP)
+_MAP_ETAG = etag_of(_MAP_BYTES)
+def zstd_compress(body):
+    # the zstd module depends on the Flask-Compress version: zstandard up to
+    # 1.17, compression.zstd / its backport after; None if neither is installed
+    try:
+        import zstandard
+        return zstandard.ZstdCompressor(level=19).compress(body)
+    except ImportError:
+        pass
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            from backports import zstd
+        except ImportError:
+            return None
+    return zstd.compress(body, level=19)
+
+
+def precompress(body):
+    # Content-Encoding -> body, for each algorithm Flask-Compress offers that we
+    # can build here; done once, at the highest levels, since the body is fixed
+    encoded = {"gzip": gzip.compress(body, 9), "deflate": zlib.compress(body, 9)}
+    try:
+        import brotli
+        encoded["br"] = brotli.compress(body, quality=11)
+    except ImportError:
+        pass
+    zstd_body = zstd_compress(body)
+    if zstd_body is not None:
+        encoded["zstd"] = zstd_body
+    return encoded
+
+# MAP is the largest payload, so its compressed bodies are also built once, one
+# per encoding a browser may prefer; the ETag suffix follows Flask-Compress's
+# convention for compressed representations
+_MAP_ENCODED = precompress(_MAP_BYTES)
+# in COMPRESS_ALGORITHM (server preference) order, for best_match() ties
+_MAP_ENCODINGS = [a for a in app.config["COMPRESS_ALGORITHM"] if a in _MAP_ENCODED]
+
+# reverse indexes for /generate; the first PEO/IEG listing a code wins
+def invert_mapping(mapping):
+    index = {}
+    for owner, codes in mapping.items():
+        for code in codes:
+            index.setdefault(code, owner)
+    return index
+
+_PLO_TO_PEO = invert_mapping(MAP["PEOtoPLO"])
+_PEO_TO_IEG = invert_mapping(MAP["IEGtoPEO"])
+
 
 # ------------------------------------------------------
 # Excel helpers
 # ------------------------------------------------------
+# sheet name -> DataFrame for the sheets the app reads from SCLOG.xlsx,
+# rebuilt only when the workbook's mtime changes
+_SHEET_CACHE = {}
+_SHEET_MTIME = None
+# serialises reloads so concurrent requests parse the workbook once, not once each
+_WORKBOOK_LOCK = threading.RLock()
+
+def read_snapshot_rows():
+    # {"source": digest of the SCLOG.xlsx it was built from, "sheets": {title: rows}};
+    # a snapshot of any other workbook version is ignored
+    snapshot = safe_load_json(SNAPSHOT_PATH)
+    if not snapshot or snapshot.get("source") != workbook_digest():
+        return None
+    return snapshot.get("sheets")
+
+
+EMPTY_SHEET = ((), [])
+
+def normalise_sheet(rows):
+    # -> (header labels, data row tuples) with blank rows dropped; labels are
+    # stripped here once, so lookups never re-strip them
+    rows = [tuple(r) for r in rows if any(v is not None for v in r)]
+    if not rows:
+        return EMPTY_SHEET
+    header = tuple(
+        str(h).strip() if h is not None else f"Unnamed: {i}"
+        for i, h in enumerate(rows[0])
+    )
+    return header, rows[1:]
+
+
+def cell(row, i):
+    return row[i] if i is not None and i < len(row) else None
+
+
+def cell_text(v):
+    # raw cells may be None, numbers or dates; str fields want text
+    return "" if v is None else str(v)
+
+
+def load_sheets():
+    global _SHEET_CACHE, _SHEET_MTIME, _PLO_INDEX, _CRITERION, _BLOOMS, _VERBS
+
+    mtime = os.path.getmtime(WORKBOOK_PATH) if os.path.exists(WORKBOOK_PATH) else None
+    if mtime == _SHEET_MTIME:
+        return _SHEET_CACHE
+
+    with _WORKBOOK_LOCK:
+        # another thread may have finished the reload while we waited
+        if mtime == _SHEET_MTIME:
+            return _SHEET_CACHE
+        rows_by_sheet = {}
+        if mtime is not None:
+            try:
+                rows_by_sheet = read_snapshot_rows() or read_workbook_rows()
+            except:
+                # locked / half-written file: keep serving what we have and leave
+                # _SHEET_MTIME alone, so the next request tries the read again
+                return _SHEET_CACHE
+        sheets = {name.strip(): normalise_sheet(rows) for name, rows in rows_by_sheet.items()}
+        _PLO_INDEX = build_plo_indexes(sheets)
+        _CRITERION = build_criterion_index(sheets.get("Criterion", EMPTY_SHEET))
+        _BLOOMS, _VERBS = build_bloom_indexes(sheets)
+        _SHEET_CACHE = sheets
+        # drop the old version's entries, then publish the mtime last so
+        # lock-free readers never see it before the indexes
+        lru_cache_clear_all()
+        _SHEET_MTIME = mtime
+        return _SHEET_CACHE
+
+
+def workbook_cache(maxsize):
+    # lru_cache with the loaded workbook version (_SHEET_MTIME) as an extra key:
+    # an answer a reader computed from the old indexes while a reload swapped
+    # them is filed under the old version, so it's never served once the new
+    # version is published
+    def decorate(fn):
+        cached = lru_cache(maxsize=maxsize)(lambda version, *args, **kwargs: fn(*args, **kwargs))
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return cached(_SHEET_MTIME, *args, **kwargs)
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorate
+
+
+def lru_cache_clear_all():
+    # every workbook_cache'd helper; called whenever the workbook is (re)loaded
+    for fn in (get_plo_details, resolve_meta, get_meta_data,
+               blooms_json, verbs_json, meta_json, bootstrap_json):
+        fn.cache_clear()
+
+
 def load_df(sheet_name):
-    if not os.path.exists(WORKBOOK_PATH):
-        return pd.DataFrame()
-    try:
-        return pd.read_excel(WORKBOOK_PATH, sheet_name=sheet_name, engine="openpyxl")
-    except:
+    # DataFrame view for ad-hoc use; request handlers only touch the indexes
+    import pandas as pd
+
+    header, rows = load_sheets().get(sheet_name, EMPTY_SHEET)
+    if not header:
         return pd.DataFrame()
+    return pd.DataFrame([list(r) for r in rows], columns=list(header))
 
 
-PROFILE_SHEET_MAP = {
-    "health": "Mapping_health",
-    "sc": "Mapping_sc",
-    "eng": "Mapping_eng",
-    "socs": "Mapping_socs",
-    "edu": "Mapping_edu",
-    "bus": "Mapping_bus",
-    "arts": "Mapping_arts"
-}
+_VALID_PROFILES = frozenset(PROFILE_SHEET_MAP)
 
-def get_mapping_sheet(profile):
-    sheet = PROFILE_SHEET_MAP.get(profile, "Mapping")
-    df = load_df(sheet)
-    if df.empty:
-        df = load_df("Mapping")
-    return df
+def norm_profile(profile):
+    # canonical names skip the lower(); missing/blank means "sc" (the UI's
+    # unselected dropdown), anything else unknown is None and the route rejects it
+    if profile in _VALID_PROFILES:
+        return profile
+    profile = (profile or "").strip().lower() or "sc"
+    return profile if profile in _VALID_PROFILES else None
 
+# done once per request at the route; the memoised helpers below take these
+# canonical keys as-is and never re-normalise them
+def norm_code(code):
+    # PLO/PEO codes as the sheets key them ("plo1 " -> "PLO1")
+    return (code or "").strip().upper()
 
-def get_plo_details(plo, profile="sc"):
-    df = get_mapping_sheet(profile)
-    if df.empty:
-        return None
+def norm_key(text):
+    # blooms and verbs, as the indexes key them (" Apply" -> "apply")
+    return (text or "").strip().lower()
 
-    df.columns = [str(c).strip() for c in df.columns]
-    col_plo = df.columns[0]
-    mask = df[col_plo].astype(str).str.upper() == str(plo).upper()
+# profile -> {PLO (stripped, upper) -> details, with "Domain" lowercased}; rebuilt by load_sheets() with the sheets
+_PLO_INDEX = {}
 
-    if not mask.any():
-        return None
+def build_plo_index(sheet):
+    cols, rows = sheet
 
-    row = df[mask].iloc[0]
-    return {
-        "SC_Code": row.get("SC Code", row.get("SCCode", "")),
-        "SC_Desc": row.get("SC Description", row.get("SCDescription", "")),
-        "VBE": row.get("VBE", ""),
-        "Domain": row.get("Domain", "")
+    def pos(*names):
+        return next((cols.index(n) for n in names if n in cols), None)
+
+    fields = {
+        "SC_Code": pos("SC Code", "SCCode"),
+        "SC_Desc": pos("SC Description", "SCDescription"),
+        "VBE": pos("VBE"),
+        "Domain": pos("Domain")
     }
 
+    index = {}
+    for row in rows:
+        details = {k: (cell(row, i) if i is not None else "") for k, i in fields.items()}
+        # stored in canonical (stripped, lowercase) form so callers use it as-is
+        details["Domain"] = str(details["Domain"] or "").strip().lower()
+        # first row wins, as with the old mask lookup
+        index.setdefault(str(row[0]).strip().upper(), details)
+    return index
+
+
+def build_plo_indexes(sheets):
+    return {profile: build_plo_index(sheets.get(name, EMPTY_SHEET))
+            for profile, name in PROFILE_SHEET_MAP.items()}
+
+
+# memoised per (plo, profile) and workbook version, so request handlers call
+# load_sheets() first to make sure that version is current
+@workbook_cache(maxsize=512)
+def get_plo_details(plo, profile="sc"):
+    load_sheets()
+    index = _PLO_INDEX.get(profile, {})
+    return index.get(plo)
+
 
 # ------------------------------------------------------
 # META (Criterion + Condition)
 # ------------------------------------------------------
+# (domain, bloom) -> (criterion, condition); rebuilt by load_sheets()
+_CRITERION = {}
+
+# domain -> (condition connector, condition used when Criterion has none)
+DOMAIN_DEFAULTS = {
+    "cognitive": ("when", "interpreting tasks"),
+    "affective": ("when", "engaging with peers"),
+    "psychomotor": ("by", "performing skills")
+}
+
+# leading connector(s); Criterion conditions often carry their own "when ...",
+# which resolve_meta() strips so the domain connector isn't doubled
+LEADING_CONN = re.compile(r"^(?:(?:when|by)\s+)+", re.IGNORECASE)
+
+def strip_connector(condition):
+    # only the leading connectors go; a "by"/"when" inside the phrase stays
+    return LEADING_CONN.sub("", condition, count=1).strip()
+
+def build_criterion_index(sheet):
+    index = {}
+    header, rows = sheet
+    if len(header) < 2:
+        return index
+
+    def text(row, i):
+        v = cell(row, i)
+        return "" if v is None else str(v).strip()
+
+    for row in rows:
+        # "Cognitive " / " Apply" in the sheet still match
+        key = (text(row, 0).lower(), text(row, 1).lower())
+        index.setdefault(key, (text(row, 2), text(row, 3)))
+    return index
+
+
+# (domain, bloom) -> (criterion, connector, condition without its connector);
+# shared by /api/get_meta and /generate so both resolve the Criterion row,
+# defaults and connector the same way
+@workbook_cache(maxsize=512)
+def resolve_meta(domain, bloom):
+    criterion, condition = _CRITERION.get((domain, bloom), ("", ""))
+    connector, default_condition = DOMAIN_DEFAULTS.get(domain, ("when", ""))
+    return criterion, connector, strip_connector(condition or default_condition)
+
+
+@workbook_cache(maxsize=512)
 def get_meta_data(plo, bloom, profile="sc"):
     details = get_plo_details(plo, profile)
     if not details:
         return {}
 
-    domain = (details.get("Domain") or "").lower()
-    criterion = ""
-    condition = ""
-
-    df = load_df("Criterion")
-    if not df.empty:
-        df.columns = [c.strip() for c in df.columns]
-
-        left = df.iloc[:,0].astype(str).str.lower()
-        right = df.iloc[:,1].astype(str).str.lower()
-
-        mask = (left == domain) & (right == str(bloom).lower())
-        if mask.any():
-            row = df[mask].iloc[0]
-            if len(row) > 2:
-                criterion = str(row.iloc[2])
-            if len(row) > 3:
-                condition = str(row.iloc[3])
-
-    if not condition:
-        defaults = {
-            "cognitive": "interpreting tasks",
-            "affective": "engaging with peers",
-            "psychomotor": "performing skills"
-        }
-        condition = defaults.get(domain, "")
-
-    connector = "by" if domain == "psychomotor" else "when"
+    domain = details["Domain"]
+    criterion, connector, condition = resolve_meta(domain, bloom)
+
     cond_final = f"{connector} {condition}"
 
     return {
@@ -155,57 +444,56 @@ def get_meta_data(plo, bloom, profile="sc"):
 # ------------------------------------------------------
 # Assessment / Evidence
 # ------------------------------------------------------
-def get_assessment(plo, bloom, domain):
-    b = bloom.lower()
-    d = domain.lower()
-
-    cognitive = {
-        "remember": ["MCQ","Recall quiz"],
-        "understand": ["Short answer","Concept explanation"],
-        "apply": ["Case study","Problem-solving"],
-        "analyze": ["Data analysis","Critique"],
-        "analyse": ["Data analysis","Critique"],
-        "evaluate": ["Evaluation report"],
-        "create": ["Design project","Proposal"]
-    }
-
-    affective = {
-        "receive": ["Reflection log"],
-        "respond": ["Participation","Peer feedback"],
-        "value": ["Value essay"],
-        "organization": ["Group portfolio"],
-        "characterization": ["Professional behaviour assessment"]
-    }
+# (domain, bloom) -> suggested assessments
+ASSESSMENT_MAP = {
+    ("cognitive", "remember"): ["MCQ","Recall quiz"],
+    ("cognitive", "understand"): ["Short answer","Concept explanation"],
+    ("cognitive", "apply"): ["Case study","Problem-solving"],
+    ("cognitive", "analyze"): ["Data analysis","Critique"],
+    ("cognitive", "analyse"): ["Data analysis","Critique"],
+    ("cognitive", "evaluate"): ["Evaluation report"],
+    ("cognitive", "create"): ["Design project","Proposal"],
+
+    ("affective", "receive"): ["Reflection log"],
+    ("affective", "respond"): ["Participation","Peer feedback"],
+    ("affective", "value"): ["Value essay"],
+    ("affective", "organization"): ["Group portfolio"],
+    ("affective", "characterization"): ["Professional behaviour assessment"],
+
+    ("psychomotor", "perception"): ["Observation"],
+    ("psychomotor", "set"): ["Preparation checklist"],
+    ("psychomotor", "guided response"): ["Guided task"],
+    ("psychomotor", "mechanism"): ["Skills test"],
+    ("psychomotor", "complex overt response"): ["OSCE"],
+    ("psychomotor", "adaptation"): ["Adapted task"],
+    ("psychomotor", "origination"): ["Capstone practical"]
+}
 
-    psychomotor = {
-        "perception": ["Observation"],
-        "set": ["Preparation checklist"],
-        "guided response": ["Guided task"],
-        "mechanism": ["Skills test"],
-        "complex overt response": ["OSCE"],
-        "adaptation": ["Adapted task"],
-        "origination": ["Capstone practical"]
-    }
+def get_assessment(bloom, domain):
+    # domain arrives canonical from the PLO index; a plain dict lookup, so no cache
+    d = domain if domain in ("affective", "psychomotor") else "cognitive"
+    return ASSESSMENT_MAP.get((d, bloom), [])
 
-    if d == "affective": return affective.get(b, [])
-    if d == "psychomotor": return psychomotor.get(b, [])
-    return cognitive.get(b, [])
 
+EVIDENCE_MAP = {
+    "mcq": ["score report"],
+    "quiz": ["quiz score"],
+    "analysis": ["analysis sheet"],
+    "critique": ["written critique"],
+    "skills": ["skills checklist"],
+    "osce": ["OSCE score sheet"],
+    "reflection": ["reflection journal"]
+}
 
+# keys are tried in EVIDENCE_MAP order, so a name containing two keywords
+# ("Quiz with reflection") maps to the earlier key, not the leftmost match;
+# the lru_cache means each assessment name is only scanned once
+@lru_cache(maxsize=512)
 def get_evidence_for(assessment):
     a = assessment.lower()
-    mapping = {
-        "mcq": ["score report"],
-        "quiz": ["quiz score"],
-        "analysis": ["analysis sheet"],
-        "critique": ["written critique"],
-        "skills": ["skills checklist"],
-        "osce": ["OSCE score sheet"],
-        "reflection": ["reflection journal"]
-    }
-    for k,v in mapping.items():
-        if k in a:
-            return v
+    for key, evidence in EVIDENCE_MAP.items():
+        if key in a:
+            return evidence
     return ["assessment evidence"]
 
 
@@ -227,12 +515,22 @@ CONTENT_SUGGESTIONS = {
     ]
 }
 
+# casefolded field -> encoded suggestions, built once
+_CONTENT_BYTES = {k.casefold(): orjson.dumps(v) for k, v in CONTENT_SUGGESTIONS.items()}
+_CONTENT_ETAG = etag_of(orjson.dumps(CONTENT_SUGGESTIONS))
+
+@lru_cache(maxsize=256)
+def content_json(field_norm):
+    # partial names ("medical", "computer") fall back to a substring match
+    return next((v for k, v in _CONTENT_BYTES.items() if field_norm in k), b"[]")
+
+
 @app.route("/api/content/<field>")
 def api_content(field):
-    for k in CONTENT_SUGGESTIONS:
-        if k.lower() == field.lower():
-            return jsonify(CONTENT_SUGGESTIONS[k])
-    return jsonify([])
+    # Werkzeug has already percent-decoded the path segment
+    field_norm = field.casefold()
+    body = _CONTENT_BYTES.get(field_norm) or content_json(field_norm)
+    return static_json(body, _CONTENT_ETAG)
 
 
 # ------------------------------------------------------
@@ -240,135 +538,260 @@ def api_content(field):
 # ------------------------------------------------------
 @app.route("/api/mapping")
 def api_mapping():
-    return jsonify(MAP)
-
-@app.route("/api/get_peos/<ieg>")
+    # the client's preferred encoding among the prebuilt bodies, picked the way
+    # Flask-Compress would (quality first, then server order)
+    encoding = request.accept_encodings.best_match(_MAP_ENCODINGS)
+    if encoding:
+        # Flask-Compress leaves responses that already carry Content-Encoding alone
+        response = static_json(_MAP_ENCODED[encoding], f"{_MAP_ETAG}:{encoding}")
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+    return static_json(_MAP_BYTES, _MAP_ETAG)
+
+# MAP is fixed after boot, so every body is encoded once at import
+_PEOS_BYTES = {k: orjson.dumps(v) for k, v in MAP["IEGtoPEO"].items()}
+_PLOS_BYTES = {k: orjson.dumps(v) for k, v in MAP["PEOtoPLO"].items()}
+
+def key_rule(name, keys):
+    # restrict a URL segment to the known codes so the router 404s anything else;
+    # with an empty MAP the segment stays open and the handlers return []
+    if not keys:
+        return f"<{name}>"
+    return "<any(%s):%s>" % (", ".join(f'"{k}"' for k in keys), name)
+
+@app.route(f"/api/get_peos/{key_rule('ieg', _PEOS_BYTES)}")
 def api_get_peos(ieg):
-    return jsonify(MAP["IEGtoPEO"].get(ieg, []))
+    return static_json(_PEOS_BYTES.get(ieg, b"[]"), _MAP_ETAG)
 
-@app.route("/api/get_plos/<peo>")
+@app.route(f"/api/get_plos/{key_rule('peo', _PLOS_BYTES)}")
 def api_get_plos(peo):
-    return jsonify(MAP["PEOtoPLO"].get(peo, []))
+    return static_json(_PLOS_BYTES.get(peo, b"[]"), _MAP_ETAG)
 
 
 # ------------------------------------------------------
 # LOGIC explanations
 # ------------------------------------------------------
+_IEG_PEO_LOGIC = {
+    "IEG1": "IEG1 focuses on knowledge & critical thinking. PEO1 operationalises these outcomes.",
+    "IEG2": "IEG2 emphasises ethics & professionalism. PEO2 aligns with these values.",
+    "IEG3": "IEG3 promotes socio-entrepreneurship. PEO3 guides this development.",
+    "IEG4": "IEG4 strengthens communication. PEO4 builds communication competence.",
+    "IEG5": "IEG5 focuses on leadership & lifelong learning. PEO5 supports these traits."
+}
+
+# (PEO, PLO) -> explanation
+_PEO_PLO_LOGIC = {
+    ("PEO1", "PLO1"): "Knowledge → foundation for PEO1",
+    ("PEO1", "PLO2"): "Critical thinking → supports PEO1",
+    ("PEO1", "PLO3"): "Analysis ability → supports PEO1",
+    ("PEO1", "PLO6"): "Real-world application → supports PEO1",
+    ("PEO1", "PLO7"): "Problem-solving → supports PEO1",
+    ("PEO2", "PLO11"): "Ethics & professionalism → supports PEO2",
+    ("PEO3", "PLO9"): "Sustainability → supports PEO3",
+    ("PEO3", "PLO10"): "Societal wellbeing → supports PEO3",
+    ("PEO4", "PLO5"): "Communication skills → supports PEO4",
+    ("PEO5", "PLO4"): "Teamwork → supports PEO5",
+    ("PEO5", "PLO8"): "Leadership → supports PEO5",
+    ("PEO5", "PLO9"): "Global challenges → supports PEO5"
+}
+
 @app.route("/api/logic/ieg_peo/<ieg>")
 def logic_ieg_peo(ieg):
-    explanation = {
-        "IEG1": "IEG1 focuses on knowledge & critical thinking. PEO1 operationalises these outcomes.",
-        "IEG2": "IEG2 emphasises ethics & professionalism. PEO2 aligns with these values.",
-        "IEG3": "IEG3 promotes socio-entrepreneurship. PEO3 guides this development.",
-        "IEG4": "IEG4 strengthens communication. PEO4 builds communication competence.",
-        "IEG5": "IEG5 focuses on leadership & lifelong learning. PEO5 supports these traits."
-    }
-    return explanation.get(ieg, "No logic found."), 200, {"Content-Type": "text/plain"}
+    return _IEG_PEO_LOGIC.get(ieg, "No logic found."), 200, _TEXT_HDR
 
 
 @app.route("/api/logic/peo_plo/<peo>/<plo>")
 def logic_peo_plo(peo, plo):
-    logic_map = {
-        "PEO1": {
-            "PLO1":"Knowledge → foundation for PEO1",
-            "PLO2":"Critical thinking → supports PEO1",
-            "PLO3":"Analysis ability → supports PEO1",
-            "PLO6":"Real-world application → supports PEO1",
-            "PLO7":"Problem-solving → supports PEO1"
-        },
-        "PEO2": {"PLO11":"Ethics & professionalism → supports PEO2"},
-        "PEO3": {"PLO9":"Sustainability → supports PEO3","PLO10":"Societal wellbeing → supports PEO3"},
-        "PEO4": {"PLO5":"Communication skills → supports PEO4"},
-        "PEO5": {"PLO4":"Teamwork → supports PEO5","PLO8":"Leadership → supports PEO5","PLO9":"Global challenges → supports PEO5"}
-    }
-    return logic_map.get(peo, {}).get(plo, "No logic available."), 200, {"Content-Type":"text/plain"}
+    return _PEO_PLO_LOGIC.get((peo, plo), "No logic available."), 200, _TEXT_HDR
 
 
 # ------------------------------------------------------
 # BLOOM & VERB endpoints (Excel)
 # ------------------------------------------------------
-@app.route("/api/get_blooms/<plo>")
-def api_get_blooms(plo):
-    profile = request.args.get("profile","sc").lower()
+# domain -> [bloom, ...] and domain -> {bloom -> (verb, ...)}; rebuilt by load_sheets()
+_BLOOMS = {}
+_VERBS = {}
+
+def build_bloom_indexes(sheets):
+    blooms, verbs = {}, {}
+    for domain, name in BLOOM_SHEETS.items():
+        blooms[domain] = []
+        verbs[domain] = {}
+        for row in sheets.get(name, EMPTY_SHEET)[1]:
+            if row[0] is None:
+                continue
+            bloom = str(row[0])
+            blooms[domain].append(bloom)
+            raw = cell(row, 1)
+            # split once per workbook load; tuples so the shared lists can't be mutated
+            verbs[domain].setdefault(bloom.lower(), () if raw is None else tuple(
+                v.strip() for v in str(raw).split(",") if v.strip()
+            ))
+    return blooms, verbs
+
+
+# encoded bodies for the workbook-backed endpoints, per workbook version
+@workbook_cache(maxsize=512)
+def blooms_json(plo, profile):
     details = get_plo_details(plo, profile)
     if not details:
-        return jsonify([])
-    domain = details["Domain"].lower()
+        return b"[]"
 
-    sheet_map = {
-        "cognitive":"Bloom_Cognitive",
-        "affective":"Bloom_Affective",
-        "psychomotor":"Bloom_Psychomotor"
-    }
-    df = load_df(sheet_map.get(domain,"Bloom_Cognitive"))
-    if df.empty:
-        return jsonify([])
+    domain = details["Domain"]
+    return orjson.dumps(_BLOOMS.get(domain, _BLOOMS.get("cognitive", [])))
 
-    blooms = df.iloc[:,0].dropna().astype(str).tolist()
-    return jsonify(blooms)
 
-
-@app.route("/api/get_verbs/<plo>/<bloom>")
-def api_get_verbs(plo, bloom):
-    profile = request.args.get("profile","sc").lower()
+@workbook_cache(maxsize=512)
+def verbs_json(plo, bloom, profile):
     details = get_plo_details(plo, profile)
     if not details:
-        return jsonify([])
+        return b"[]"
 
-    domain = details["Domain"].lower()
-    sheet_map = {
-        "cognitive":"Bloom_Cognitive",
-        "affective":"Bloom_Affective",
-        "psychomotor":"Bloom_Psychomotor"
-    }
+    domain = details["Domain"]
+    if domain not in BLOOM_SHEETS:
+        domain = "cognitive"
+    return orjson.dumps(_VERBS.get(domain, {}).get(bloom, ()))
 
-    df = load_df(sheet_map.get(domain,"Bloom_Cognitive"))
-    if df.empty:
-        return jsonify([])
 
-    mask = df.iloc[:,0].astype(str).str.lower() == bloom.lower()
-    if not mask.any():
-        return jsonify([])
+@app.route("/api/get_blooms/<plo>")
+def api_get_blooms(plo):
+    profile = norm_profile(request.args.get("profile"))
+    if profile is None:
+        return jsonify({"error": "Unknown profile"}), 400
+    load_sheets()
+    return workbook_json(blooms_json(norm_code(plo), profile))
 
-    raw = df[mask].iloc[0,1]
-    verbs = [v.strip() for v in str(raw).split(",") if v.strip()]
-    return jsonify(verbs)
+
+@app.route("/api/get_verbs/<plo>/<bloom>")
+def api_get_verbs(plo, bloom):
+    profile = norm_profile(request.args.get("profile"))
+    if profile is None:
+        return jsonify({"error": "Unknown profile"}), 400
+    load_sheets()
+    return workbook_json(verbs_json(norm_code(plo), norm_key(bloom), profile))
 
 
 # ------------------------------------------------------
 # META endpoint
 # ------------------------------------------------------
+@workbook_cache(maxsize=512)
+def meta_json(plo, bloom, profile):
+    return orjson.dumps(get_meta_data(plo, bloom, profile))
+
+
 @app.route("/api/get_meta/<plo>/<bloom>")
 def api_get_meta(plo, bloom):
-    profile = request.args.get("profile","sc").lower()
-    return jsonify(get_meta_data(plo, bloom, profile))
+    profile = norm_profile(request.args.get("profile"))
+    if profile is None:
+        return jsonify({"error": "Unknown profile"}), 400
+    load_sheets()
+    return workbook_json(meta_json(norm_code(plo), norm_key(bloom), profile))
+
+
+# ------------------------------------------------------
+# BOOTSTRAP endpoint (everything the dropdowns need, in one response)
+# ------------------------------------------------------
+@workbook_cache(maxsize=1)
+def bootstrap_json():
+    # criterion's (domain, bloom) keys are flattened to "domain|bloom" for JSON
+    return orjson.dumps({
+        "map": MAP,
+        "plos": _PLO_INDEX,
+        "blooms": _BLOOMS,
+        "verbs": _VERBS,
+        "criterion": {f"{d}|{b}": list(v) for (d, b), v in _CRITERION.items()},
+        "domain_defaults": {d: list(v) for d, v in DOMAIN_DEFAULTS.items()},
+        "content": CONTENT_SUGGESTIONS
+    })
+
+
+@app.route("/api/bootstrap")
+def api_bootstrap():
+    load_sheets()
+    return workbook_json(bootstrap_json())
 
 
 # ------------------------------------------------------
 # STATEMENT endpoint
 # ------------------------------------------------------
+# ("PEO"/"PLO", level, code) -> statement, flattened once from MAP
+STATEMENT_INDEX = {
+    (stype, level, code): text
+    for stype, key in (("PEO", "PEOstatements"), ("PLO", "PLOstatements"))
+    for level, statements in MAP[key].items()
+    for code, text in statements.items()
+}
+_STATEMENT_BYTES = {k: orjson.dumps(v) for k, v in STATEMENT_INDEX.items()}
+
 @app.route("/api/get_statement/<level>/<stype>/<code>")
 def api_get_statement(level, stype, code):
-    if stype == "PEO":
-        return jsonify(MAP["PEOstatements"].get(level, {}).get(code, ""))
-    if stype == "PLO":
-        return jsonify(MAP["PLOstatements"].get(level, {}).get(code, ""))
-    return jsonify("")
+    body = _STATEMENT_BYTES.get((stype.upper(), level, code), b'""')
+    return static_json(body, _MAP_ETAG)
 
 
 # ------------------------------------------------------
 # GENERATE CLO
 # ------------------------------------------------------
-LAST_CLO = {}
+# the last generated CLO rides in the signed session cookie, so concurrent users
+# never download each other's CLO and whichever worker serves /download can render
+# it; rendered files are cached per worker by (CLO id, kind), bounded, for an hour
+_FILE_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_FILE_LOCK = threading.Lock()
+
+
+# leading words treated as a verb and dropped from the CLO content
+ACTION_VERBS = frozenset({
+    "interpret","advocate","assess","examine","explain",
+    "analyze","analyse","evaluate","apply","perform","design",
+    "investigate","critique","discuss","use","demonstrate",
+    "measure","review"
+})
+
+# /generate response; msgspec encodes it from the fixed field layout and it is
+# also what the downloads render from
+class GeneratedCLO(msgspec.Struct):
+    clo: str
+    variants: dict[str, str]
+    plo: str
+    peo: str | None
+    ieg: str | None
+    sc_code: str
+    sc_desc: str
+    vbe: str
+    domain: str
+    criterion: str
+    condition: str
+    plo_indicator: str
+    plo_statement: str
+    peo_statement: str
+    assessments: list[str]
+    evidence: dict[str, list[str]]
+
+
+def upper_first(text):
+    # unlike str.capitalize(), leaves the rest alone so "DNA" / "ECG" survive
+    return text[:1].upper() + text[1:]
+
+
+# variant name -> sentence template; every variant goes through upper_first()
+VARIANT_TEMPLATES = {
+    "Standard": "{verb} {content} using {sc_desc} {connector} {condition} guided by {vbe}.",
+    "Critical Thinking": "{verb} {content} critically using {sc_desc} {connector} {condition} guided by {vbe}.",
+    "Short": "{verb} {content}."
+}
+
 
 @app.route("/generate", methods=["POST"])
 def generate():
-    global LAST_CLO
-
-    profile = request.form.get("profile", "sc")
-    plo = request.form.get("plo", "")
-    bloom = request.form.get("bloom", "")
-    verb = request.form.get("verb", "")
+    load_sheets()
+
+    profile = norm_profile(request.form.get("profile"))
+    if profile is None:
+        return jsonify({"error": "Unknown profile"}), 400
+    plo = norm_code(request.form.get("plo"))
+    bloom = norm_key(request.form.get("bloom"))
+    verb = norm_key(request.form.get("verb"))
     content = request.form.get("content", "")
     level = request.form.get("level", "Degree")
 
@@ -376,156 +799,190 @@ def generate():
     if not details:
         return jsonify({"error": "Invalid PLO"}), 400
 
-    domain = details["Domain"].lower()
-    sc_desc = details["SC_Desc"]
-    vbe = details["VBE"]
+    domain = details["Domain"]
+    sc_desc = cell_text(details["SC_Desc"])
+    vbe = cell_text(details["VBE"])
 
     # META
-    meta = get_meta_data(plo, bloom, profile)
-    condition_clean = meta["condition"].replace("when ", "").replace("by ", "")
+    criterion, connector, condition = resolve_meta(domain, bloom)
 
     # ------------------------------------------------------
     # SMART VERB CLEANER (correct indentation)
     # ------------------------------------------------------
-    words = content.strip().split()
-    if words:
-        first_word = words[0].lower()
-        selected = verb.lower()
-
-        # Case 1: content starts with same verb
-        if first_word == selected:
-            content = " ".join(words[1:])
-        else:
+    first_word, _, rest = content.strip().partition(" ")
+    first_word = first_word.lower()
+    if first_word:
+        looks_like_verb = (
+            # Case 1: content starts with same verb
+            first_word == verb or
             # Case 2: verb-like detection
-            common_verbs = {
-                "interpret","advocate","assess","examine","explain",
-                "analyze","analyse","evaluate","apply","perform","design",
-                "investigate","critique","discuss","use","demonstrate",
-                "measure","review"
-            }
+            first_word in ACTION_VERBS or
+            first_word.endswith(("ed", "ing"))
+        )
 
-            looks_like_verb = (
-                first_word in common_verbs or
-                first_word.endswith(("ed", "ing"))
-            )
-
-            if looks_like_verb:
-                content = " ".join(words[1:])
+        if looks_like_verb:
+            content = rest.strip()
 
     # ------------------------------------------------------
     # Build CLO
     # ------------------------------------------------------
-    connector = "when" if domain != "psychomotor" else "by"
-
-    clo = (
-        f"{verb.lower()} {content} using {sc_desc.lower()} "
-        f"{connector} {condition_clean} guided by {vbe.lower()}."
-    ).capitalize()
+    ctx = {
+        "verb": verb, "content": content, "sc_desc": sc_desc.lower(),
+        "connector": connector, "condition": condition, "vbe": vbe.lower()
+    }
 
     # ------------------------------------------------------
     # Variants
     # ------------------------------------------------------
     variants = {
-        "Standard": clo,
-        "Critical Thinking": clo.replace("using", "critically using"),
-        "Short": f"{verb.capitalize()} {content}."
+        name: upper_first(template.format_map(ctx))
+        for name, template in VARIANT_TEMPLATES.items()
     }
+    clo = variants["Standard"]
 
     # ------------------------------------------------------
     # Map PEO + IEG
     # ------------------------------------------------------
-    peo = next((p for p, plos in MAP["PEOtoPLO"].items() if plo in plos), None)
-    ieg = next((i for i, peos in MAP["IEGtoPEO"].items() if peo in peos), None)
+    peo = _PLO_TO_PEO.get(plo)
+    ieg = _PEO_TO_IEG.get(peo)
 
     # ------------------------------------------------------
     # Assessments + Evidence
     # ------------------------------------------------------
-    assessments = get_assessment(plo, bloom, domain)
+    assessments = get_assessment(bloom, domain)
     evidence = {a: get_evidence_for(a) for a in assessments}
 
     # ------------------------------------------------------
     # Save for download
     # ------------------------------------------------------
-    LAST_CLO = {
-        "clo": clo,
-        "variants": variants,
-        "plo": plo,
-        "peo": peo,
-        "ieg": ieg,
-        "sc_code": details["SC_Code"],
-        "sc_desc": details["SC_Desc"],
-        "vbe": vbe,
-        "domain": domain,
-        "criterion": meta["criterion"],
-        "condition": condition_clean,
-        "plo_indicator": MAP["PLOIndicators"].get(plo, ""),
-        "plo_statement": MAP["PLOstatements"].get(level, {}).get(plo, ""),
-        "peo_statement": MAP["PEOstatements"].get(level, {}).get(peo, ""),
-        "assessments": assessments,
-        "evidence": evidence,
-    }
+    last_clo = GeneratedCLO(
+        clo=clo,
+        variants=variants,
+        plo=plo,
+        peo=peo,
+        ieg=ieg,
+        sc_code=cell_text(details["SC_Code"]),
+        sc_desc=sc_desc,
+        vbe=vbe,
+        domain=domain,
+        criterion=criterion,
+        condition=condition,
+        plo_indicator=MAP["PLOIndicators"].get(plo, ""),
+        plo_statement=STATEMENT_INDEX.get(("PLO", level, plo), ""),
+        peo_statement=STATEMENT_INDEX.get(("PEO", level, peo), ""),
+        assessments=assessments,
+        evidence=evidence,
+    )
+
+    body = msgspec.json.encode(last_clo)
+    session["clo"] = msgspec.to_builtins(last_clo)
+    session["clo_id"] = etag_of(body)
 
-    return jsonify(LAST_CLO)
+    return json_response(body)
 
 # ------------------------------------------------------
 # DOWNLOADS
 # ------------------------------------------------------
-@app.route("/download")
-def download_clo():
-    if not LAST_CLO:
-        return "No CLO generated", 400
+def build_xlsx(sheet_title, rows):
+    # xlsxwriter streams rows straight to XML (no openpyxl cell tree)
+    out = BytesIO()
+    wb = xlsxwriter.Workbook(out, {"in_memory": True, "constant_memory": True})
+    ws = wb.add_worksheet(sheet_title)
+    for i, row in enumerate(rows):
+        ws.write_row(i, 0, row)
+    wb.close()
+    return out.getvalue()
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "CLO"
 
-    ws.append(["Field","Value"])
+def clo_rows(last_clo):
+    rows = [["Field","Value"]]
 
-    for key, val in LAST_CLO.items():
+    for key, val in msgspec.structs.asdict(last_clo).items():
         if isinstance(val, dict):
             continue
         if isinstance(val, list):
             val = "; ".join(str(x) for x in val)
-        ws.append([key, val])
+        rows.append([key, val])
+
+    return rows
+
+
+def render_clo_xlsx(last_clo):
+    return build_xlsx("CLO", clo_rows(last_clo))
+
+
+def render_clo_csv(last_clo):
+    out = StringIO()
+    csv.writer(out).writerows(clo_rows(last_clo))
+    # BOM so Excel opens the file as UTF-8 (statements contain ≥, → etc.)
+    return out.getvalue().encode("utf-8-sig")
+
+
+def render_rubric_xlsx(last_clo):
+    return build_xlsx("Rubric", [
+        ["Component","Description"],
+        ["Indicator", f"Ability to {last_clo.clo}"],
+        ["Excellent","Performs at excellent level"],
+        ["Good","Performs well"],
+        ["Satisfactory","Meets minimum level"],
+        ["Poor","Below expected"]
+    ])
+
+
+def cached_file(kind, render):
+    # rendered once per generated CLO and worker; None if this session has no CLO
+    data = session.get("clo")
+    if not data:
+        return None
+    key = (session.get("clo_id"), kind)
+    with _FILE_LOCK:
+        body = _FILE_CACHE.get(key)
+    if body is None:
+        body = render(msgspec.convert(data, GeneratedCLO))
+        with _FILE_LOCK:
+            _FILE_CACHE[key] = body
+    return body
+
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def send_download(body, fname, mimetype=XLSX_MIMETYPE):
+    # the bytes are already in memory, so skip send_file's file-object wrapping;
+    # the content hash lets a repeat request for the same CLO answer 304
+    response = Response(body, mimetype=mimetype, headers={
+        "Content-Disposition": f'attachment; filename="{fname}"',
+        "Cache-Control": "no-store"
+    })
+    response.set_etag(hashlib.md5(body).hexdigest())
+    return response.make_conditional(request)
+
+
+@app.route("/download")
+def download_clo():
+    body = cached_file("clo", render_clo_xlsx)
+    if body is None:
+        return "No CLO generated", 400, _TEXT_HDR
 
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
     fname = f"CLO_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+    return send_download(body, fname)
 
-    return send_file(
-        out,
-        as_attachment=True,
-        download_name=fname,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+@app.route("/download.csv")
+def download_clo_csv():
+    body = cached_file("csv", render_clo_csv)
+    if body is None:
+        return "No CLO generated", 400, _TEXT_HDR
+
+    fname = f"CLO_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+    return send_download(body, fname, "text/csv")
 
 @app.route("/download_rubric")
 def download_rubric():
-    if not LAST_CLO:
-        return "Generate CLO first", 400
+    body = cached_file("rubric", render_rubric_xlsx)
+    if body is None:
+        return "Generate CLO first", 400, _TEXT_HDR
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Rubric"
-
-    ws.append(["Component","Description"])
-    ws.append(["Indicator", f"Ability to {LAST_CLO['clo']}"])
-    ws.append(["Excellent","Performs at excellent level"])
-    ws.append(["Good","Performs well"])
-    ws.append(["Satisfactory","Meets minimum level"])
-    ws.append(["Poor","Below expected"])
-
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
     fname = f"Rubric_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-
-    return send_file(
-        out, as_attachment=True,
-        download_name=fname,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    return send_download(body, fname)
 
 
 # ------------------------------------------------------
@@ -536,11 +993,26 @@ def index():
     return render_template("generator.html")
 
 
+# ------------------------------------------------------
+# WARM-UP
+# ------------------------------------------------------
+# parse SCLOG.xlsx and build the indexes in a background thread at import (i.e.
+# in each worker at boot), so the worker starts accepting connections straight
+# away; a request that lands mid-parse waits on _WORKBOOK_LOCK instead of parsing
+# the workbook a second time. /api/bootstrap has no caller in generator.html yet,
+# so its payload is left to be encoded on first request
+threading.Thread(target=load_sheets, name="warm-caches", daemon=True).start()
+
+
 # ------------------------------------------------------
 # RUN
 # ------------------------------------------------------
+# local run only; deploy behind gunicorn, e.g.
+#   SECRET_KEY=... gunicorn -w 4 -k gthread --threads 8 app:app
+# (workers share nothing in memory: the last CLO travels in the session cookie,
+# so every worker needs the same SECRET_KEY, or the shared .secret_key file)
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0")
+    app.run(host="0.0.0.0", port=5000, threaded=True, debug=False)
 
 
 
@@ -0,0 +1,24 @@
+# ======================================================
+# Build SCLOG_snapshot.json from SCLOG.xlsx
+# ======================================================
+# Run after editing the workbook (or at deploy time):
+#   python build_snapshot.py
+# app.py then loads the sheets from the JSON instead of parsing the xlsx,
+# as long as the snapshot was built from the current SCLOG.xlsx.
+
+import orjson
+
+# workbook.py, not app.py: importing the app would also start its cache warm-up
+from workbook import SNAPSHOT_PATH, read_workbook_rows, workbook_digest
+
+
+def main():
+    snapshot = {"source": workbook_digest(), "sheets": read_workbook_rows()}
+    with open(SNAPSHOT_PATH, "wb") as f:
+        # read_workbook_rows() already reduced every cell to a JSON type
+        f.write(orjson.dumps(snapshot))
+    print(f"Wrote {SNAPSHOT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
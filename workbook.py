@@ -0,0 +1,72 @@
+# ======================================================
+# SCLOG.xlsx readers (shared by app.py and build_snapshot.py)
+# ======================================================
+# No Flask here: build_snapshot.py imports this module, so reading the workbook
+# doesn't set up the app or start its cache warm-up thread.
+
+import os
+import hashlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WORKBOOK_PATH = os.path.join(BASE_DIR, "SCLOG.xlsx")
+# pre-parsed copy of the used sheets, written by build_snapshot.py
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "SCLOG_snapshot.json")
+
+# profile -> its PLO mapping sheet
+PROFILE_SHEET_MAP = {
+    "health": "Mapping_health",
+    "sc": "Mapping_sc",
+    "eng": "Mapping_eng",
+    "socs": "Mapping_socs",
+    "edu": "Mapping_edu",
+    "bus": "Mapping_bus",
+    "arts": "Mapping_arts"
+}
+
+# domain -> its Bloom level / verb sheet
+BLOOM_SHEETS = {
+    "cognitive": "Bloom_Cognitive",
+    "affective": "Bloom_Affective",
+    "psychomotor": "Bloom_Psychomotor"
+}
+
+
+def used_sheet_names():
+    return {"Criterion", *PROFILE_SHEET_MAP.values(), *BLOOM_SHEETS.values()}
+
+
+def plain_cell(v):
+    # cells as JSON can carry them, so rows read from the xlsx and rows loaded
+    # from the snapshot have the same types; dates/times become str(v)
+    if v is None or v == "":
+        return None
+    return v if isinstance(v, (str, int, float)) else str(v)
+
+
+def read_workbook_rows():
+    # one open of SCLOG.xlsx, then every used sheet from that handle;
+    # calamine (Rust) parses ~2x faster, openpyxl read-only mode is the fallback
+    wanted = used_sheet_names()
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        from openpyxl import load_workbook
+        wb = load_workbook(WORKBOOK_PATH, read_only=True, data_only=True)
+        try:
+            # titles are matched stripped ("Mapping_socs " has a stray trailing space)
+            return {t: [tuple(map(plain_cell, row))
+                        for row in wb[t].iter_rows(values_only=True)]
+                    for t in wb.sheetnames if t.strip() in wanted}
+        finally:
+            wb.close()
+
+    wb = CalamineWorkbook.from_path(WORKBOOK_PATH)
+    return {t: [tuple(map(plain_cell, row))
+                for row in wb.get_sheet_by_name(t).to_python()]
+            for t in wb.sheet_names if t.strip() in wanted}
+
+
+def workbook_digest():
+    with open(WORKBOOK_PATH, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()